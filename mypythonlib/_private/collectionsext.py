@@ -1,10 +1,25 @@
 """My extension of the python collections."""
 
+import sys
+import functools
 from collections.abc import Mapping
 from typing import Any
 
 __all__ = ['ROdict']
 
+_MISSING = object()  # Marks the keys absent before ROdict.update()
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_copy(cls: type):
+    """Return the copy() method of the class or None if it doesn't have one.
+
+    Only copy() defined on the type is honoured, an attribute 'copy' set on
+    an instance is ignored.
+    """
+    copy = getattr(cls, 'copy', None)
+    return copy if callable(copy) else None
+
 
 class ROdict(Mapping):
     """Dict with protected (read only) items.
@@ -20,7 +35,13 @@ class ROdict(Mapping):
     raise exception with custom text).
     """
 
+    __slots__ = ('_dict', '_protected')
+
     def __init__(self, *args: Mapping, **kwargs: Any):
+        if len(args) == 1 and not kwargs and isinstance(args[0], ROdict) and \
+                self._has_default_init_hooks():
+            self._copy_from(args[0])
+            return
         initdict, self._dict, self._protected = {}, {}, set()
         # if len(args)>0:
         for arg in args:
@@ -28,9 +49,9 @@ class ROdict(Mapping):
         initdict.update(kwargs)
         for key, val in initdict.items():
             if testres := self._test_under(key):
-                self._item_add_new_as_under(testres['key'], val, init=True, dbl=testres['dbl'])
+                self._item_add_new_as_under(self._intern_key(testres[0]), val, testres[1], True)
             else:
-                self._item_add_new_as_normal(key, val, init=True)
+                self._item_add_new_as_normal(self._intern_key(key), val, True)
 
     @staticmethod
     def __to_initdict(obj: Mapping) -> dict:
@@ -38,32 +59,57 @@ class ROdict(Mapping):
         if not isinstance(obj, Mapping):
             raise TypeError(f"Unsupported type of the argument: {type(obj)}")
         if isinstance(obj, ROdict):
-            return {'__' + k: v for k, v in obj._dict.items() if k in obj._protected} | \
-                {k: v for k, v in obj._dict.items() if k not in obj._protected}
+            protected = obj._protected
+            return {('__' + k if k in protected else k): v for k, v in obj._dict.items()}
         else:
             return dict(obj)
 
+    def _copy_from(self, other: 'ROdict'):
+        """Initialize self as a copy of other ROdict bypassing the _item_* hooks."""
+        val_copy = self._val_copy
+        self._dict = {k: val_copy(v) for k, v in other._dict.items()}
+        self._protected = set(other._protected)
+
+    @classmethod
+    def _has_default_init_hooks(cls) -> bool:
+        """Test whether the hooks used by __init__ are not overridden in the subclass."""
+        return (cls._item_add_new_as_under is ROdict._item_add_new_as_under and
+                cls._item_add_new_as_normal is ROdict._item_add_new_as_normal and
+                cls._item_change_existing_as_under is ROdict._item_change_existing_as_under)
+
+    @classmethod
+    def _has_default_get_hooks(cls) -> bool:
+        """Test whether the hooks used for reading the items are not overridden in the subclass."""
+        return (cls._item_get_existing_as_normal is ROdict._item_get_existing_as_normal and
+                cls._item_get_missing_as_normal is ROdict._item_get_missing_as_normal and
+                cls._item_get_existing_as_under is ROdict._item_get_existing_as_under and
+                cls._item_get_missing_as_under is ROdict._item_get_missing_as_under)
+
     @staticmethod
-    def _test_under(key) -> bool | dict:
-        """Test whether the passed key stars from '_' or '__'."""
-        if not isinstance(key, str):
+    def _test_under(key) -> tuple[str, bool] | None:
+        """Test whether the passed key stars from '_' or '__'.
+
+        Return the tuple (stripped_key, dbl) for the '_key' and '__key' forms
+        and None for the normal keys.
+        """
+        if type(key) is not str and not isinstance(key, str):
             raise TypeError(f"Wrong key '{key}'. Only string keys are supported.")
-        if key.startswith('_'):  # '_key'
-            dbl = False
-            key = key[1:]
-            if key.startswith('_'):  # '__key'
-                key = key[1:]
-                dbl = True
-            return dict(key=key, dbl=dbl)
-        return False
+        if key[:1] != '_':  # Most common case: normal key
+            return None
+        if key[1:2] == '_':  # '__key'
+            return key[2:], True
+        return key[1:], False  # '_key'
+
+    @staticmethod
+    def _intern_key(key: str) -> str:
+        """Intern a new key so further lookups can match it by identity."""
+        return sys.intern(key) if type(key) is str else key
 
     @staticmethod
     def _val_copy(val):
-        if hasattr(val, 'copy'):
-            if callable(val.copy):
-                return val.copy()
-        else:
-            return val
+        """Return val.copy() if the value's type has the copy() method or val itself."""
+        copy = _resolve_copy(type(val))
+        return copy(val) if copy else val
 
     # ########################################
     # Functions to be overridden in subclasses
@@ -129,48 +175,65 @@ class ROdict(Mapping):
 
     # ####################################
 
+    # Plain str keys without '_' are recognized in place, the rest goes to _test_under()
     def __getitem__(self, key):
         """Return self[key]."""
-        if testres := self._test_under(key):
-            if testres['key'] in self._dict:
-                return self._item_get_existing_as_under(**testres)
-            else:
-                return self._item_get_missing_as_under(**testres)
-        else:
+        if (type(key) is not str or key[:1] == '_') and (testres := self._test_under(key)):
+            key, dbl = testres
             if key in self._dict:
-                return self._item_get_existing_as_normal(key)
-            else:
-                return self._item_get_missing_as_normal(key)
+                return self._item_get_existing_as_under(key, dbl)
+            return self._item_get_missing_as_under(key, dbl)
+        if key in self._dict:
+            return self._item_get_existing_as_normal(key)
+        return self._item_get_missing_as_normal(key)
 
     def __setitem__(self, key, val):
         """Set self[key] to value."""
-        if testres := self._test_under(key):
-            if testres['key'] in self._dict:
-                self._item_change_existing_as_under(testres['key'], val, dbl=testres['dbl'])
-            else:
-                self._item_add_new_as_under(testres['key'], val, dbl=testres['dbl'], init=False)
-        else:
+        if (type(key) is not str or key[:1] == '_') and (testres := self._test_under(key)):
+            key, dbl = testres
             if key in self._dict:
-                self._item_change_existing_as_normal(key, val)
+                self._item_change_existing_as_under(key, val, dbl)
             else:
-                self._item_add_new_as_normal(key, val, init=False)
+                self._item_add_new_as_under(self._intern_key(key), val, dbl, False)
+        elif key in self._dict:
+            self._item_change_existing_as_normal(key, val)
+        else:
+            self._item_add_new_as_normal(self._intern_key(key), val, False)
 
     def __delitem__(self, key):
         """Delete self[key]."""
-        if testres := self._test_under(key):
-            if testres['key'] in self._dict:
-                self._item_del_existing_as_under(**testres)
-            else:
-                self._item_del_missing_as_under(**testres)
-        else:
+        if (type(key) is not str or key[:1] == '_') and (testres := self._test_under(key)):
+            key, dbl = testres
             if key in self._dict:
-                self._item_del_existing_as_normal(key)
+                self._item_del_existing_as_under(key, dbl)
             else:
-                self._item_del_missing_as_normal(key)
+                self._item_del_missing_as_under(key, dbl)
+        elif key in self._dict:
+            self._item_del_existing_as_normal(key)
+        else:
+            self._item_del_missing_as_normal(key)
+
+    def __contains__(self, key):
+        """Return key in self (without copying the value as Mapping does)."""
+        if not self._has_default_get_hooks():  # The hooks may return values for missing keys
+            return Mapping.__contains__(self, key)
+        if (type(key) is not str or key[:1] == '_') and (testres := self._test_under(key)):
+            key = testres[0]
+        return key in self._dict
+
+    def __eq__(self, other):
+        """Return self == other comparing the stored values without copying."""
+        if not self._has_default_get_hooks():  # Compare the values the hooks return
+            return Mapping.__eq__(self, other)
+        if isinstance(other, ROdict) and other._has_default_get_hooks():
+            return self._dict == other._dict
+        if isinstance(other, Mapping):
+            return self._dict == dict(other.items())
+        return NotImplemented
 
     def rokeys(self):
         """Return iter through list of read-only keys."""
-        yield from self._protected
+        return iter(self._protected)
 
     def __len__(self):
         """Return number of entries in the dict."""
@@ -178,21 +241,62 @@ class ROdict(Mapping):
 
     def __iter__(self):
         """Iterate through the dict keys."""
-        yield from self._dict
+        return iter(self._dict)
 
     def __str__(self):
         """Return string representation."""
-        br = ', '.join(
-            [f'{k}*: {v}' for k, v in self._dict.items() if k in self._protected] +
-            [f'{k}: {v}' for k, v in self._dict.items() if k not in self._protected])
+        protected, normal, protected_keys = [], [], self._protected
+        for k, v in self._dict.items():
+            if k in protected_keys:
+                protected.append(f'{k}*: {v}')
+            else:
+                normal.append(f'{k}: {v}')
+        br = ', '.join(protected + normal)
         return self.__class__.__name__ + f' {{{br}}}'
 
     def dict(self):
         """Return standard python dict."""
+        if type(self)._item_get_existing_as_normal is ROdict._item_get_existing_as_normal:
+            val_copy = self._val_copy  # The same copies as self[key] returns
+            return {k: val_copy(v) for k, v in self._dict.items()}
         return dict(self)
 
     def copy(self):
         """Return a copy."""
         return self.__class__(self)
 
+    def update(self, *args: Mapping, **kwargs: Any):
+        """Set the items from the mappings and kwargs as self[key] = val does.
 
+        Keys of the protected items of an ROdict argument get the '__' prefix
+        like in __init__. All the arguments are converted before the first
+        item is set and if setting any item fails, the previous values of
+        the touched keys are restored (changes made by the hooks outside
+        these items are not).
+        """
+        items = []
+        for arg in args:
+            items.extend(self.__to_initdict(arg).items())
+        items.extend(kwargs.items())
+        _dict, protected = self._dict, self._protected
+        saved = {}  # Stored key: (previous value or _MISSING, whether it was protected)
+        setitem = self.__setitem__
+        try:
+            for key, val in items:
+                stored_key = key
+                if (type(key) is not str or key[:1] == '_') and (testres := self._test_under(key)):
+                    stored_key = testres[0]
+                if stored_key not in saved:
+                    saved[stored_key] = _dict.get(stored_key, _MISSING), stored_key in protected
+                setitem(key, val)
+        except BaseException:
+            for key, (val, was_protected) in saved.items():
+                if val is _MISSING:
+                    _dict.pop(key, None)
+                else:
+                    _dict[key] = val
+                if was_protected:
+                    protected.add(key)
+                else:
+                    protected.discard(key)
+            raise
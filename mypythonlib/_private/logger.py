@@ -1,26 +1,57 @@
 """Log user messages and output of external programs."""
 
 import os
+import sys
+import atexit
+import codecs
 import time
+import shlex
+import shutil
 import subprocess
-import inspect
+import threading
 from enum import StrEnum
 from .pathlibext import FilePath, FilePathAbs
 from ..packaging import getmainname
 
 
+_OWNPKGNAME = getmainname(__name__)
+
+_LOG_TIME_FORMAT = '%Y %b %d %H:%M:%S'
+_LOGFILE_BUFFER_SIZE = 65536  # The logfile is flushed when it's closed or before calling a command
+
+# Commands with these characters are passed to the shell, others are run directly
+_SHELL_SPECIAL_CHARS = frozenset('|&;<>()$`\\*?[]{}~!#\n')
+
 _COLOR_SEQUENCES = {'red': '91m', 'yellow': '93m', 'green': '92m',
                     'cyan': '96m', 'bold': '01m'}
 
 
+_PROGNAME_CODES = {}  # code object: whether its name can be used as progname
+_PROGNAME_CODES_MAXSIZE = 4096
+
+
+def _is_progname_frame(frame) -> bool:
+    """Test whether the function of the frame is a user's function to be used as progname."""
+    progname = frame.f_code.co_name
+    modulepath = frame.f_code.co_filename
+    return (_OWNPKGNAME not in modulepath and   # Exclude any functions of this package
+            os.path.basename(modulepath) != 'functools.py' and  # Exclude stdlib
+            progname[0] != '_' and   # Exclude 'under'-methods
+            progname in frame.f_globals)  # Excluded __main__ and class members
+
+
 class _ColorsMixin():
     """Provide self.print() for the 'Color' enum."""
 
     def print(self, text):
-        print('\033[' + _COLOR_SEQUENCES[self.name] + text + '\033[0m')
+        # A single write with the newline; print() does nothing if sys.stdout is None
+        print(self._template.format(text), end='')
 
 
 Colors = StrEnum('Colors', names=list(_COLOR_SEQUENCES.keys()), type=_ColorsMixin)
+for _color in Colors:  # Bind the format template of the colored line to each member
+    _color._template = '\033[' + _COLOR_SEQUENCES[_color.name] + '{}\033[0m\n'
+del _color
 
 
 # logging.basicConfig(format = '%(filename)-5s %(levelname)-8s [%(asctime)s]  %(message)s', level = logging.DEBUG)
@@ -32,22 +63,27 @@ class _OutputProcessor:
     as well as the std stream from external programmes called.
     ."""
 
+    __slots__ = ('_flogfile', 'force_bw', 'default_progname', '_timestamp_sec', '_timestamp')
+
     __instance = None  # Make a singleton
 
     def __new__(cls, *args):
         if not cls.__instance:
             cls.__instance = super().__new__(cls)
+            atexit.register(cls.__instance.close_logfile)  # Flush the buffered lines
         return cls.__instance
 
     def __init__(self, force_bw: bool = False):
         self._flogfile = None  # file descriptor
         self.force_bw = force_bw
+        self.default_progname = None  # Used instead of searching the caller's name
+        self._timestamp_sec = None  # Last formatted second and its text
+        self._timestamp = ''
 
     def open_logfile(self, path: str | FilePath):
         self.close_logfile()
-        is_exists = os.path.exists(path)
-        self._flogfile = open(path, 'a')
-        if is_exists:  # Separate new output from previous
+        self._flogfile = open(path, 'a', buffering=_LOGFILE_BUFFER_SIZE)
+        if self._flogfile.tell() > 0:  # Separate new output from previous
             self._flogfile.write('\n')
 
     def close_logfile(self):
@@ -55,22 +91,76 @@ class _OutputProcessor:
             self._flogfile.close()
             self._flogfile = None
 
+    @staticmethod
+    def _write_stdin(child: subprocess.Popen, stdin: str | bytes):
+        """Pass the text to stdin of the child process and close it."""
+        try:
+            if stdin:
+                child.stdin.write(stdin)
+            child.stdin.close()
+        except BrokenPipeError:  # The child has exited without reading it
+            pass
+
+    @staticmethod
+    def _popen(cmd: str, **kwargs) -> subprocess.Popen:
+        """Run a simple command directly and the rest through /bin/sh."""
+        if _SHELL_SPECIAL_CHARS.isdisjoint(cmd):
+            try:
+                args = shlex.split(cmd)
+            except ValueError:  # Unbalanced quotes, let the shell report it
+                args = None
+            if args:
+                try:
+                    return subprocess.Popen(args, **kwargs)
+                except OSError:  # Not an executable (e.g. a shell builtin or an assignment)
+                    pass
+        return subprocess.Popen(cmd, shell=True, **kwargs)
+
     def _call_popen(self, cmd: str, stdin: str, catch_output: bool):
+        if self._flogfile:  # The command may write into the logfile too
+            self._flogfile.flush()
         if catch_output:
-            child = subprocess.Popen(cmd, shell=True, stderr=subprocess.STDOUT,
-                                     stdout=subprocess.PIPE, stdin=subprocess.PIPE, universal_newlines=True)
-            child.stdin.write(stdin)
-            child.stdin.flush()
-            child.stdin.close()
-            for line in child.stdout:
-                self._flogfile.write(line)
+            child = self._popen(cmd, stderr=subprocess.STDOUT, stdout=subprocess.PIPE,
+                                stdin=subprocess.PIPE, universal_newlines=True)
+            # Feed stdin from another thread to not deadlock when both pipes are full
+            feeder = threading.Thread(target=self._write_stdin, args=(child, stdin), daemon=True)
+            feeder.start()
+            shutil.copyfileobj(child.stdout, self._flogfile, _LOGFILE_BUFFER_SIZE)
             self._flogfile.flush()
+            feeder.join()
         else:
-            child = subprocess.Popen(cmd, shell=True, stderr=subprocess.STDOUT,
-                                     stdin=subprocess.PIPE, universal_newlines=True)
-            child.stdin.write(stdin)
-            child.stdin.flush()
-            child.stdin.close()
+            child = self._popen(cmd, stderr=subprocess.STDOUT, stdin=subprocess.PIPE,
+                                universal_newlines=True)
+            self._write_stdin(child, stdin)
+        child.wait()
+        return child
+
+    def _call_popen_tee(self, cmd: str, stdin: str, teepath: FilePathAbs):
+        """Call the command copying its output to the terminal and to the file."""
+        if self._flogfile:
+            self._flogfile.flush()
+        sys.stdout.flush()
+        out = getattr(sys.stdout, 'buffer', None)
+        # Chunks may split multibyte characters if they are written as text
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace') if out is None else None
+        with open(teepath, 'ab') as ftee:  # Open it first to not leave the child unread
+            child = self._popen(cmd, stderr=subprocess.STDOUT, stdout=subprocess.PIPE,
+                                stdin=subprocess.PIPE)
+            feeder = threading.Thread(target=self._write_stdin, args=(child, stdin.encode()),
+                                      daemon=True)
+            feeder.start()
+            fd = child.stdout.fileno()
+            while chunk := os.read(fd, _LOGFILE_BUFFER_SIZE):  # Returns what's available
+                if decoder is None:
+                    out.write(chunk)
+                    out.flush()
+                else:
+                    sys.stdout.write(decoder.decode(chunk))
+                ftee.write(chunk)
+            if decoder is not None:
+                sys.stdout.write(decoder.decode(b'', final=True))
+        child.stdout.close()
+        feeder.join()
         child.wait()
         return child
 
@@ -80,9 +170,8 @@ class _OutputProcessor:
         self.print_colored_and_log(cmd, progname, color=Colors.bold)
         command = extra_start + cmd + extra_end
         if separate_logfile:
-            command = 'set -o pipefail; ' + command + ' | tee -a ' + os.fspath(separate_logfile)
             self.onlylog(f"See log in '{separate_logfile}'", progname=None)
-            child = self._call_popen(command, stdin, False)
+            child = self._call_popen_tee(command, stdin, separate_logfile)
         elif self._flogfile:
             child = self._call_popen(command, stdin, True)
         else:
@@ -102,35 +191,47 @@ class _OutputProcessor:
     @staticmethod
     def _getprogname():
         """Return name of the function which is not an _under and not a class member."""
-        ownpkgname = getmainname(__name__)
-        modulename = progname = ''
-        stack = inspect.stack()
-        for frame in stack[3:]:  # i=0 is _getprogname() and i=1 and 2 is the functions inside this module
-            module = inspect.getmodule(frame[0])
-            progname = frame[3]
-            modulepath = module.__file__
-            modulename = os.path.basename(modulepath)
-
-            if (ownpkgname not in modulepath and   # Exclude any functions of this package
-                modulename not in ('functools.py') and  # Exclude stdlib
-                progname[0] != '_' and   # Exclude 'under'-methods
-                hasattr(module, progname) ):  # Excluded __main__
-                break
-        return modulename if progname == '<module>' else progname
+        code = None
+        try:  # i=0 is _getprogname() and i=1 and 2 is the functions inside this module
+            frame = sys._getframe(3)
+        except ValueError:
+            frame = None
+        while frame is not None:
+            code = frame.f_code
+            is_progname = _PROGNAME_CODES.get(code)
+            if is_progname is None:
+                if len(_PROGNAME_CODES) >= _PROGNAME_CODES_MAXSIZE:
+                    _PROGNAME_CODES.clear()
+                is_progname = _PROGNAME_CODES[code] = _is_progname_frame(frame)
+            if is_progname:
+                return code.co_name
+            frame = frame.f_back
+        if code is None:
+            return ''
+        return os.path.basename(code.co_filename) if code.co_name == '<module>' else code.co_name
 
     def _prepare_text(self, text: str, *, progname: str = None, msgtype: str = ''):
         """Inject progname ans msgtype to the string message."""
         if progname is None:  # Use None to get default and '' for empty progname
-            progname = self._getprogname()
-        progtxt = f'[{progname}]:' if progname else ''  # Use ''
-        return ' '.join([x for x in [progtxt, msgtype, text] if x])
+            progname = self.default_progname
+            if progname is None:
+                progname = self._getprogname()
+        if progname:
+            if msgtype:
+                return f'[{progname}]: {msgtype} {text}' if text else f'[{progname}]: {msgtype}'
+            return f'[{progname}]: {text}' if text else f'[{progname}]:'
+        if msgtype:
+            return f'{msgtype} {text}' if text else msgtype
+        return text
 
     def _log_text(self, text: str) -> None:
         """Put the text into the logfile."""
         if self._flogfile:
-            timestamp = time.strftime('%Y %b %d %H:%M:%S', time.localtime())
-            self._flogfile.write(timestamp + ' - ' + text + '\n')
-            self._flogfile.flush()
+            sec = int(time.time())
+            if sec != self._timestamp_sec:  # Format the time only once per second
+                self._timestamp_sec = sec
+                self._timestamp = time.strftime(_LOG_TIME_FORMAT, time.localtime(sec)) + ' - '
+            self._flogfile.write(self._timestamp + text + '\n')
 
     def onlylog(self, text: str, progname: str = None, msgtype: str = '') -> None:
         self._log_text(self._prepare_text(text, progname=progname, msgtype=msgtype))
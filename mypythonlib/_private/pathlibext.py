@@ -1,7 +1,10 @@
 """Some classes extending the standard library's PurePath."""
 
 import os
+import sys
+import functools
 import time
+import weakref
 from typing import Self, TypeVar, Union
 from pathlib import Path, PurePosixPath
 
@@ -13,6 +16,28 @@ TPath = TypeVar('TPath', bound=Union[str, os.PathLike])
 TAbsPath = TypeVar('TAbsPath', bound='FilePathAbs')
 
 
+def _parse_posix_str(path: str) -> tuple[str, str, list[str]]:
+    """Split a single posix path string the same way as PurePosixPath does."""
+    if path[:1] == '/':
+        # Exactly two leading slashes are kept as the root (POSIX allows special meaning)
+        root = '//' if path[1:2] == '/' and path[2:3] != '/' else '/'
+        parts = [root]
+        parts += [sys.intern(x) for x in path.split('/') if x and x != '.']
+    else:
+        root = ''
+        parts = [sys.intern(x) for x in path.split('/') if x and x != '.']
+    return '', root, parts
+
+
+@functools.lru_cache(maxsize=4096)
+def _absolute_filepath(cwd: str, path: str) -> 'FilePathAbs':
+    """Return FilePathAbs for the relative path, CWD is the part of the cache key."""
+    return FilePathAbs(os.path.join(cwd, path))
+
+
+_PURE_PARSE_ARGS = PurePosixPath._parse_args.__func__  # To detect subclasses overriding it
+
+
 class FilePath(PurePosixPath):
     """Extension of pathlib's PurePath.
 
@@ -21,10 +46,30 @@ class FilePath(PurePosixPath):
     the baseclass for TempfilePath and ExtPath classes.
     """
 
+    __slots__ = ()
+
     _class_abspath = None  # abspath  brother class, to be redefined below
 
     def __new__(cls, *args):
-        drv, root, parts = cls._parse_args(args)
+        # The shortcuts are only for the classes parsing the arguments as PurePosixPath
+        # does (a subclass like myfits.ExtPath may override _parse_args)
+        if len(args) == 1 and cls._parse_args.__func__ is _PURE_PARSE_ARGS:
+            src = args[0]
+            if isinstance(src, PurePosixPath):
+                # Already parsed path, reuse its parts (they are never mutated)
+                # and the cached string representation if it's ready
+                obj = FilePath._from_parsed_parts.__func__(cls, src._drv, src._root, src._parts)
+                try:
+                    obj._str = src._str
+                except AttributeError:
+                    pass
+                return obj
+            if type(src) is str:
+                drv, root, parts = _parse_posix_str(src)
+            else:
+                drv, root, parts = cls._parse_args(args)
+        else:
+            drv, root, parts = cls._parse_args(args)
         # Explicitly call the own method with cls argument passed to not
         # break myfits.ExtPath
         return FilePath._from_parsed_parts.__func__(cls, drv, root, parts)
@@ -58,28 +103,47 @@ class FilePath(PurePosixPath):
 
     def absolute(self):
         """Add CWD to the file path to make it absolute."""
-        return self if self.is_absolute() else self._class_abspath(os.getcwd(), self)
+        if self._root:
+            return self
+        if self._class_abspath is FilePathAbs:
+            return _absolute_filepath(os.getcwd(), str(self))
+        return self._class_abspath(os.getcwd(), self)
+
+    def _with_edited_name(self, name: str) -> Self:
+        """Replace the filename without reparsing it (like with_name() does)."""
+        if not self.name:
+            raise ValueError(f"{self!r} has an empty name")
+        if not name or name == '.' or '/' in name:
+            raise ValueError(f"Invalid name '{name}'")
+        return self._from_parsed_parts(self._drv, self._root, self._parts[:-1] + [sys.intern(name)])
 
     def with_stem_starting(self, text: str) -> Self:
         """Append string to the start of the filename."""
-        return self.with_name(f'{text}{self.name}')
+        return self._with_edited_name(text + self.name)
 
     def with_stem_ending(self, text: str) -> Self:
         """Append string to the end of the filename (before suffix)."""
-        return self.with_name(f'{self.stem}{text}{self.suffix}')
+        name = self.name
+        i = name.rfind('.')
+        if 0 < i < len(name) - 1:  # The same as PurePath.suffix
+            return self._with_edited_name(name[:i] + text + name[i:])
+        return self._with_edited_name(name + text)
 
     def with_suffix_append(self, suffix: str) -> Self:
         """Add another suffix to the existing filepath."""
         if isinstance(suffix, str):
             if not suffix.startswith('.'):
                 suffix = '.' + suffix
-            if len(suffix) > 1:
-                return self.with_suffix(self.suffix + suffix)
+            if len(suffix) > 1 and '/' not in suffix:
+                return self._with_edited_name(self.name + suffix)
         raise ValueError(f"Invalid suffix '{suffix}'")
 
     def with_parent(self, parent: str) -> Self:
         """Return a new Filepath object with another sefl.parent"""
-        drv, root, parts = self._parse_args([parent])  # Call PurePath._parse_args
+        if type(parent) is str and self._parse_args.__func__ is _PURE_PARSE_ARGS:
+            drv, root, parts = _parse_posix_str(parent)
+        else:
+            drv, root, parts = self._parse_args([parent])  # Call PurePath._parse_args
         parts.append(self.name)
         return self._from_parsed_parts(drv, root, parts)
 
@@ -91,6 +155,17 @@ class FilePath(PurePosixPath):
 class FilePathAbs(FilePath, Path):
     """Extension of the FilePath class for absolute paths."""
 
+    __slots__ = ()
+
+
+def _release_tempfile(files: dict, path: str):
+    """Unregister the tempfile path and remove the file if it's not preserved."""
+    if files.pop(path, True) is False:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
 
 class TempfilePath(FilePathAbs):
     """Class for manipulation names of tempfiles.
@@ -106,37 +181,32 @@ class TempfilePath(FilePathAbs):
     user can pass the name manually.
     """
 
-    # _files = weakref.WeakValueDictionary()  # dict to store path_str:object pairs
-    # _preserved = weakref.WeakSet()  # set of preserved files
-    _files = set()
-    _preserved = set()
+    __slots__ = ('__weakref__',)  # For the finalizer
+
+    _files = {}  # Path strings of the living objects: whether the file is preserved
 
     nameroot = 'tmp{:d}_'.format(os.getpid())
 
     def __new__(cls, *args, **kwargs):
-        obj = super().__new__(cls, *args)
-        if obj.exists():
-            raise OSError(f"Can't create tempfile. File '{obj}' already exists.")
-        if str(obj) in cls._files:
-            raise ValueError(f"Path '{obj}' is already used by different tempfile.")
-        try:  # Check file is writable
-            obj.touch()
-            obj.unlink()
-        except OSError as ex:
+        path = FilePath(*args)
+        if path.is_absolute():  # Relative paths are rejected by the constructor below
+            # Check before creating the object to not let its finalizer remove the registered file
+            if os.access(path, os.F_OK):
+                raise OSError(f"Can't create tempfile. File '{path}' already exists.")
+            if str(path) in cls._files:
+                raise ValueError(f"Path '{path}' is already used by different tempfile.")
+        obj = super().__new__(cls, path)
+        if not os.access(obj.parent, os.W_OK | os.X_OK):  # Check file can be created
             raise OSError(f"Can't create Tempfile. Path '{obj}' is not valid or "
-                          "the host directory is not writable or absent.") from ex
+                          "the host directory is not writable or absent.")
         return obj
 
     def __init__(self, *args, preserve=False):
-        self._files.add(str(self))
-
-    def __del__(self):
-        """Remove the file when the object is being deleted."""
         _str = str(self)
-        if _str in self._files and _str not in self._preserved:
-            if self.exists():
-                self.unlink()
-            self._files.remove(_str)
+        self._files[_str] = bool(preserve)
+        # Remove the file when the object is being deleted (or at exit). The callback
+        # must not refer to self, so it gets only the path string
+        weakref.finalize(self, _release_tempfile, self._files, _str)
 
     def __truediv__(self, other):
         """Return self / other."""
@@ -145,21 +215,19 @@ class TempfilePath(FilePathAbs):
     @classmethod
     def cleanup(cls):
         """Force removing all the created files. Should be used only with atexit and such."""
-        for _str in cls._files:
-            if _str not in cls._preserved:
+        for _str, preserved in cls._files.items():
+            if not preserved:
                 if os.path.exists(_str): os.remove(_str)
 
     @property
     def preserved(self):
         """Turn off automatic removing of the file."""
-        return str(self) in self._preserved
+        return self._files.get(str(self), False)
 
     @preserved.setter
     def preserved(self, val: bool):
-        if val is True:
-            self._preserved.add(self)
-        elif val is False:
-            self._preserved.discard(self)
+        if val is True or val is False:
+            self._files[str(self)] = val
         else:
             raise TypeError('Must be bool value')
 
@@ -4,12 +4,53 @@ import os
 from typing import Self
 import functools
 from collections.abc import Sequence, Iterable
-from ._private.pathlibext import FilePath, FilePathAbs, TPath
-from .main import die, Actions, check_file_exists
+from pathlib import PurePosixPath
+from ._private.pathlibext import FilePath, FilePathAbs, TPath, _parse_posix_str
+from .main import die, Actions, check_file_exists, _to_action
+
+
+def _join_path_strings(prepath: str, path: str, postpath: str) -> str:
+    """Join path strings like '/'.join() does skipping the empty ones.
+
+    Separator is not duplicated after a part ending with '/' (and leading
+    '/' of the next part is dropped there) to not turn the root '/' into '//'.
+    """
+    if prepath:
+        if not path:
+            path = prepath
+        elif prepath[-1] == '/':
+            path = prepath + path.lstrip('/')
+        else:
+            path = prepath + '/' + path
+    if postpath:
+        if not path:
+            path = postpath
+        elif path[-1] == '/':
+            path = path + postpath.lstrip('/')
+        else:
+            path = path + '/' + postpath
+    return path
+
+
+def _normalize_path_string(path: str) -> str:
+    """Return the path string the same as str(FilePath(path)) without creating the object."""
+    _, root, parts = _parse_posix_str(path)
+    if root:
+        return root + '/'.join(parts[1:])
+    return '/'.join(parts) or '.'
+
+
+_FILEPATH_TYPES = (FilePath, FilePathAbs)  # Exact types that FilePath(x) returns unchanged
 
 
 class ListofPaths(Sequence):
-    """Class to operate with lists of files to be processed."""
+    """Class to operate with lists of files to be processed.
+
+    The paths are stored as strings and converted to FilePath objects only
+    when the items are accessed.
+    """
+
+    __slots__ = ('_strs', '_list')  # Path strings and cache of the FilePath objects
 
     def __new__(cls, paths: Iterable[TPath], *, basepath: TPath | None = None):
         return cls._create_with_paths(paths, basepath)
@@ -19,27 +60,62 @@ class ListofPaths(Sequence):
         obj = object.__new__(cls)
         prepath = os.fspath(prepath or '')
         postpath = os.fspath(postpath or '')
-        obj._list = [FilePath('/'.join([y for y in (prepath, str(x), postpath) if y]))
-                     for x in lst]
+        if isinstance(lst, ListofPaths):
+            strs, cache = lst._strs.copy(), lst._list.copy()
+        else:
+            strs, cache = [], []
+            for x in lst:
+                if isinstance(x, PurePosixPath):
+                    if type(x) not in _FILEPATH_TYPES:
+                        x = FilePath(x)
+                    strs.append(str(x))
+                    cache.append(x)  # Objects are immutable, so they can be shared
+                else:
+                    x = os.fspath(x) if isinstance(x, os.PathLike) else str(x)
+                    strs.append(x or '.')  # Empty path is '.' as for FilePath
+                    cache.append(None)
+        if prepath or postpath:
+            strs = [_join_path_strings(prepath, x, postpath) for x in strs]
+            cache = [None] * len(strs)
+        obj._strs, obj._list = strs, cache
         return obj
 
     def __getitem__(self, index):
         if not isinstance(index, int):
             raise ValueError(f"Index can be only int, not {type(index)}.")
-        return self._list[index]
+        path = self._list[index]
+        if path is None:
+            path = self._list[index] = FilePath(self._strs[index])
+        return path
 
     def __setitem__(self, index, value):
-        self._list[index] = FilePath(value)
+        path = FilePath(value)
+        self._strs[index] = str(path)
+        self._list[index] = path
+
+    def __iter__(self):
+        cache = self._list
+        for i, path in enumerate(cache):
+            if path is None:
+                path = cache[i] = FilePath(self._strs[i])
+            yield path
+
+    def __contains__(self, item):
+        if isinstance(item, (str, os.PathLike)):
+            item = FilePath(item)
+        return item in iter(self)
 
     def __len__(self):
-        return len(self._list)
+        return len(self._strs)
 
     def __str__(self):
-        return self.__class__.__name__ + f'({str(self._list)})'
+        return self.__class__.__name__ + f'({str(list(self))})'
 
     def __add__(self, other: Self) -> Self:
         if isinstance(other, ListofPaths):
-            return self.__class__._create_with_paths(self._list + other._list)
+            obj = object.__new__(self.__class__)
+            obj._strs, obj._list = self._strs + other._strs, self._list + other._list
+            return obj
 
     def __truediv__(self, path: str | os.PathLike) -> Self:
         """Return self / path."""
@@ -51,22 +127,61 @@ class ListofPaths(Sequence):
 
     def names(self) -> Self:
         """Get only file names, remove dirnames."""
-        return self.__class__([x.name for x in self])
+        names = []
+        for i, path in enumerate(self._strs):
+            name = path[path.rfind('/') + 1:]
+            if not name or name == '.':  # Trailing '/' or '.', let FilePath normalize it
+                name = self[i].name
+            names.append(name)
+        return self.__class__(names)
 
     def copy(self) -> Self:
         return self.__class__._create_with_paths(self)
 
     def absolute(self, basepath: TPath | None = None) -> Self:
         """Return List with absolute paths."""
-        basepath = basepath or os.getcwd()
-        if basepath[0] != '/':
+        basepath = os.fspath(basepath or os.getcwd())
+        if basepath[:1] != '/':
             raise ValueError(f"Path basepath='{basepath}' is not absolute.")
-        return self.__class__([FilePathAbs(basepath, x) for x in self._list])
+        obj = object.__new__(self.__class__)
+        # Prepend basepath to the strings, the new paths are parsed only when accessed
+        obj._strs = [x if x[:1] == '/' else _join_path_strings(basepath, x, '')
+                     for x in self._strs]
+        obj._list = [path if x[:1] == '/' else None for x, path in zip(self._strs, self._list)]
+        return obj
+
+
+_SCANDIR_MIN_FILES = 16  # Use a single os.scandir() for a dir with so many files in the list
+
+
+def _paths_exist(paths: list[str]) -> list[bool]:
+    """Return the list of flags whether the absolute paths exist.
+
+    Files sharing the same parent directory are looked up in a single
+    os.scandir() listing instead of checking each of them. Only found
+    non-symlink entries are trusted, the rest is checked by os.access().
+    """
+    by_dir = {}
+    for i, path in enumerate(paths):
+        by_dir.setdefault(os.path.dirname(path), []).append(i)
+    flags = [False] * len(paths)
+    for dirname, indices in by_dir.items():
+        present = frozenset()  # Names of the non-symlink entries of the dir
+        if len(indices) >= _SCANDIR_MIN_FILES:
+            try:
+                with os.scandir(dirname) as it:
+                    present = frozenset([entry.name for entry in it if not entry.is_symlink()])
+            except OSError:
+                pass
+        for i in indices:
+            path = paths[i]
+            flags[i] = os.path.basename(path) in present or os.access(path, os.F_OK)
+    return flags
 
 
 @functools.singledispatch
 def check_files_in_list_exist(filelist, basepath: str = None,
-                              action: Actions = Actions.DIE, progname=None):
+                              action: Actions = Actions.DIE, progname=None, **kwargs):
     """Call Path.exists() for each file in the list.
 
     The filelist argument can be the path to an ascii file, a ListofPaths object
@@ -84,49 +199,62 @@ def check_files_in_list_exist(filelist, basepath: str = None,
 def _check_files_in_list_exist_list(filelist, basepath: str = None,
                                     action: Actions = Actions.DIE, progname: str = None):
     if not isinstance(filelist, ListofPaths):
-        filelist = ListofPaths(filelist, basepath=basepath)  # Convert each element to FilePath
-    good_files, bad_files = [], []
-    for item in map(lambda x: x.absolute(), filelist):
-        if item.exists():
-            good_files.append(item)
-        else:
-            bad_files.append(item)
-    if len(bad_files) > 0:
-        Actions(action).do(
-            "File '{}' ({:d} of {:d} in total) is not found".format(
-                bad_files[0], len(bad_files), len(filelist)),
-            progname=progname, exception_class=FileNotFoundError)
-    return ListofPaths(good_files)
+        filelist = ListofPaths(filelist, basepath=basepath)  # Join each element with basepath
+    # Check path strings as they are, without parsing to FilePath
+    cwd = os.getcwd()
+    abspaths = [path if path[:1] == '/' else _join_path_strings(cwd, path, '')
+                for path in filelist._strs]
+    return _check_abspaths_exist(abspaths, action, progname)
 
 
 @check_files_in_list_exist.register(FilePathAbs)
 def _check_files_in_list_exist_path(filelist: FilePathAbs, basepath: str = None,
                                     action: Actions = Actions.DIE, progname=None, **kwargs):
-    basepath = basepath or filelist.parent
-    listobj = ListofPaths(read_ascii_filelist(filelist, **kwargs)).absolute(basepath)
-    return _check_files_in_list_exist_list(listobj, action=action, progname=progname)
+    basepath = os.fspath(basepath or filelist.parent)
+    if basepath[:1] != '/':
+        raise ValueError(f"Path basepath='{basepath}' is not absolute.")
+    # Resolve the names right away, without intermediate ListofPaths and FilePaths
+    abspaths = [path if path[:1] == '/' else _join_path_strings(basepath, path, '')
+                for path in read_ascii_filelist(filelist, **kwargs)]
+    return _check_abspaths_exist(abspaths, action, progname)
+
+
+def _check_abspaths_exist(abspaths: list[str], action: Actions, progname: str) -> ListofPaths:
+    """Return ListofPaths of the existing paths and perform the action if some are missing."""
+    action = _to_action(action)
+    # Drop trailing '/', duplicated separators and '.' as FilePath does
+    abspaths = [_normalize_path_string(path) for path in abspaths]
+    flags = _paths_exist(abspaths)
+    good_files = [path for path, exists in zip(abspaths, flags) if exists]
+    bad_files = [path for path, exists in zip(abspaths, flags) if not exists]
+    if len(bad_files) > 0:
+        action(
+            "File '{}' ({:d} of {:d} in total) is not found".format(
+                FilePath(bad_files[0]), len(bad_files), len(abspaths)),
+            progname=progname, exception_class=FileNotFoundError)
+    return ListofPaths(good_files)
 
 
 @check_files_in_list_exist.register(str)
 def _check_files_in_list_exist_str(filelist: FilePathAbs, basepath: str = None,
                                    action: Actions = Actions.DIE, progname=None, **kwargs):
     filelist = check_file_exists(filelist, Actions.DIE, progname)
-    return _check_files_in_list_exist_path(filelist, basepath, action=action, progname=progname)
+    return _check_files_in_list_exist_path(filelist, basepath, action=action, progname=progname,
+                                           **kwargs)
 
 
 def read_ascii_filelist(ascii_path: TPath, comment_symbol: str = '#') -> list:
-    """Read ascii file ignoring comments."""
+    """Read ascii file ignoring comments and empty lines."""
+    with open(ascii_path, 'r') as fl:
+        lines = fl.read().splitlines()
     files = []
-    with open(ascii_path, 'r') as fl:  # R ead lines from file
-        for line in fl:
-            stripped = line.strip()
-            if not stripped.startswith(comment_symbol):  # Remove lines starting with #
-                word = stripped.split(comment_symbol)[0]
-                # Now we'll try to check that the file is really a file list and
-                # not a random file with text
-                if len(word.split(' ')) > 1:
-                    die("Wrong format of ASCII filelist. Filenames mustn't contain "
-                        f"spaces but string '{word}' does.")
-                files.append(word.strip())  # Remove comments at the end of the line
+    for line in lines:
+        word = line.partition(comment_symbol)[0].strip()  # Remove comments
+        if word:
+            # Now we'll try to check that the file is really a file list and
+            # not a random file with text
+            if ' ' in word:
+                die("Wrong format of ASCII filelist. Filenames mustn't contain "
+                    f"spaces but string '{word}' does.")
+            files.append(word)
     return files
-
@@ -1,7 +1,6 @@
 """Methods to perform basic checks like existence of input files and so on."""
 
 import sys, os
-import functools, inspect
 from enum import StrEnum, auto
 from typing import Union, Type, TypeVar
 from ._private.logger import _OutputProcessor, Colors
@@ -36,11 +35,13 @@ __all__ = [
 logger = _OutputProcessor()
 
 
-def set_logfile(path: TPath | None, append: bool = False):
+def set_logfile(path: TPath | None, append: bool = False, _already_checked: bool = False):
     if path is not None:
-        if append == False and os.path.exists(path):
+        # The absence of the file can be already checked by the caller
+        if append == False and not _already_checked and os.path.exists(path):
             raise OSError(f"Can't create '{path}', the file already exists.")
         logger.open_logfile(path)
+        _EXISTS_CACHE.pop(str(_abspath(path)), None)
     else:
         logger.close_logfile()
 
@@ -59,21 +60,38 @@ def logger_turn_on(logfile: Union[str, FilePath],
     path = check_file_not_exist_or_remove(
         logfile, override=False, action=Actions.DIE,
         extra_text='Please use another name or remove it manually.')
-    set_logfile(path)
-    args = sys.argv.copy()
-    args[0] = os.path.basename(args[0])
-    logtext('Started as "{}"'.format(' '.join(args)), progname)
+    set_logfile(path, _already_checked=True)
+    argv = sys.argv
+    cmdline = ' '.join([os.path.basename(argv[0]), *argv[1:]]) if argv else ''
+    logtext(f'Started as "{cmdline}"', progname)
 
 
-# Create functions with names 'print+color' and add them into namespace
+def _make_printer(name: str, color: Colors | None, msgtype: str = ''):
+    """Return the function printing (and logging) the text with the given color and msgtype."""
+    print_colored_and_log = logger.print_colored_and_log
+    default_msgtype = msgtype
+
+    def printer(text: str, progname: str = None, msgtype: str = default_msgtype, **kwargs):
+        if kwargs:  # E.g. color overriding the default one, as functools.partial allowed
+            return print_colored_and_log(text, progname, msgtype, **{'color': color, **kwargs})
+        return print_colored_and_log(text, progname, msgtype, color)
+
+    printer.__name__ = printer.__qualname__ = name
+    printer.__doc__ = "Print the message and put it into the logfile. Return the text."
+    return printer
+
+
+# Functions 'print+color' for each of the Colors, keep them in sync with the Colors
 # They return the printed text to pass it to Exception message
-printred = printyellow = printcyan = printgreen = printbold = None  # To not show 'Undefined name' error below
-for color in Colors:
-    locals()['print' + color.name] = functools.partial(logger.print_colored_and_log, color=color)
-printandlog = functools.partial(logger.print_colored_and_log, color=None)
-printerr = functools.partial(printred, msgtype='Error:')
-printwarn = functools.partial(printyellow, msgtype='Warning:')
-printinfo = functools.partial(logger.print_colored_and_log, color=None, msgtype='Info:')
+printred = _make_printer('printred', Colors.red)
+printyellow = _make_printer('printyellow', Colors.yellow)
+printgreen = _make_printer('printgreen', Colors.green)
+printcyan = _make_printer('printcyan', Colors.cyan)
+printbold = _make_printer('printbold', Colors.bold)
+printandlog = _make_printer('printandlog', None)
+printerr = _make_printer('printerr', Colors.red, 'Error:')
+printwarn = _make_printer('printwarn', Colors.yellow, 'Warning:')
+printinfo = _make_printer('printinfo', None, 'Info:')
 printcaption = printcyan
 logtext = logger.onlylog
 callandlog = logger.callandlog
@@ -81,17 +99,32 @@ callandlog = logger.callandlog
 
 def print_colored_text(text: str, color: Colors):
     """Color the output (without logging)."""
-    Colors(color).print(text)
+    if type(color) is not Colors:
+        color = Colors(color)
+    color.print(text)
 
 
 
 def getownname():
     """Return the name of the function that calls this."""
-    return inspect.stack()[1][3]
+    return sys._getframe(1).f_code.co_name
+
+
+_CAPTION_PREFIX = b'\33]0;'
+_CAPTION_SUFFIX = b'\a'
 
 
 def change_terminal_caption(text: str):
-    print('\33]0;{}\a'.format(text), end='', flush=True)
+    stdout = sys.stdout
+    try:
+        buffer = stdout.buffer
+    except AttributeError:  # Replaced stdout without the binary layer
+        print(f'\33]0;{text}\a', end='', flush=True)
+        return
+    stdout.flush()  # Keep the order with the text already printed
+    buffer.write(_CAPTION_PREFIX + text.encode(stdout.encoding or 'utf-8', 'replace')
+                 + _CAPTION_SUFFIX)
+    buffer.flush()
 
 
 def die(text: str, progname: str = None):
@@ -124,19 +157,33 @@ class Actions(StrEnum):
 
     def do(self, text: str, *, progname: str = None,
            exception_class: Type[Exception] = Exception, **kwargs):
+        _ACTIONS_HANDLERS[self](text, progname, exception_class, kwargs)
+
+    __call__ = do  # Actions.X(text, ...) is the same as Actions.X.do(text, ...)
 
-        cls = self.__class__
-        match self:
-            case cls.NOTHING:
-                return
-            case cls.DIE:
-                die(text, progname)
-            case cls.WARNING:
-                printwarn(text, progname)
-            case cls.ERROR:
-                printerr(text, progname)
-            case cls.EXCEPTION:
-                raise exception_class(text, **kwargs)
+
+def _to_action(action: Union[Actions, str]) -> Actions:
+    """Convert the value to Actions skipping the enum constructor machinery."""
+    if type(action) is Actions:
+        return action
+    try:
+        return Actions._value2member_map_[action]
+    except (KeyError, TypeError):
+        return Actions(action)  # Raise the standard ValueError
+
+
+def _raise_exception(text, progname, exception_class, kwargs):
+    raise exception_class(text, **kwargs)
+
+
+# Handlers to perform Actions, all of them take (text, progname, exception_class, kwargs)
+_ACTIONS_HANDLERS = {
+    Actions.NOTHING: lambda *args: None,
+    Actions.DIE: lambda text, progname, *args: die(text, progname),
+    Actions.WARNING: lambda text, progname, *args: printwarn(text, progname),
+    Actions.ERROR: lambda text, progname, *args: printerr(text, progname),
+    Actions.EXCEPTION: _raise_exception,
+}
 
 
 # def _check_option_is_allowed(argument:str, allowed_values:list, with_arg=''):
@@ -172,27 +219,67 @@ class Actions(StrEnum):
 #     return filepath
 
 
+def _abspath(filepath: TPath) -> TAbsPath:
+    """Return the absolute FilePath parsing a string argument only once."""
+    if isinstance(filepath, FilePath):
+        return filepath.absolute()
+    filepath = os.fspath(filepath)
+    if filepath[:1] != '/':
+        # Not os.path.abspath(): it collapses '..' which changes the path behind a symlink
+        filepath = os.path.join(os.getcwd(), filepath)
+    return FilePath(filepath)
+
+
+_EXISTS_CACHE: dict[str, bool] = {}  # Results of the checks with use_cache=True
+_EXISTS_CACHE_MAXSIZE = 1024
+
+
+def _file_exists_cached(path: str) -> bool:
+    try:
+        return _EXISTS_CACHE[path]
+    except KeyError:
+        if len(_EXISTS_CACHE) >= _EXISTS_CACHE_MAXSIZE:
+            _EXISTS_CACHE.clear()
+        exists = _EXISTS_CACHE[path] = os.access(path, os.F_OK)
+        return exists
+
+
+def _clear_exists_cache():
+    """Forget the results of the existence checks done with use_cache=True."""
+    _EXISTS_CACHE.clear()
+
+
 def check_file_exists(filepath: Union[str, FilePath],
                       action: Union[Actions, str] = Actions.DIE,
-                      progname: str = None) -> TAbsPath | None:
+                      progname: str = None, use_cache: bool = False) -> TAbsPath | None:
     """Check if the file exists and return its absolute path.
     
     It returns absolute path of the file or performs the 'action' (raise exception
-    by default) and returns None if the file doesn't exist.
+    by default) and returns None if the file doesn't exist. With use_cache=True
+    the result of the previous check of the same path is reused, call
+    check_file_exists.cache_clear() if the files could be created or removed since.
     """
-    pathobj = FilePath(filepath).absolute()
-    if not pathobj.exists():
-        Actions(action).do(f"File '{filepath}' is not found", progname=progname,
+    pathobj = _abspath(filepath)
+    if use_cache:
+        exists = _file_exists_cached(str(pathobj))
+    else:
+        exists = os.access(pathobj, os.F_OK)
+    if not exists:
+        _to_action(action)(f"File '{filepath}' is not found", progname=progname,
                            exception_class=FileNotFoundError)
         return None
     return pathobj
 
 
+check_file_exists.cache_clear = _clear_exists_cache
+
+
 def check_file_not_exist_or_remove(
         filepath: Union[FilePath, str],
         override: bool = False, action: Union[Actions, str] = Actions.DIE,
         extra_text: str = '', progname: str = None, remove_warning: bool = True,
-        exception_class: Type[Exception] = FileExistsError) -> TAbsPath | None:
+        exception_class: Type[Exception] = FileExistsError,
+        use_cache: bool = False) -> TAbsPath | None:
     """Check if the file doesn't exist to further create it.
     
     Return absolute path if the file doesn't exist or if it's allowed to override it.
@@ -209,16 +296,22 @@ def check_file_not_exist_or_remove(
     :param remove_warning: Print warning if file exists, but it's allowed to be deleted.
         If false, the file will be deleted silently. The default is True.
     :param exception_class: Exception class for Actions.EXCEPTION. The default is FileExistsError.
+    :param use_cache: Reuse the result of the previous check of the same path
+        (see check_file_exists). The default is False.
     :return: Absolute path to the file being tested.
     """
-    pathobj = FilePath(filepath).absolute()
-    if pathobj.exists():
-        if override:
-            pathobj.unlink()
+    pathobj = _abspath(filepath)
+    if override:
+        try:  # Just try to remove instead of checking the existence first
+            os.remove(pathobj)
+        except FileNotFoundError:
+            pass
+        else:
+            _EXISTS_CACHE.pop(str(pathobj), None)
             if remove_warning:
                 printwarn(f"File '{filepath}' will be replaced", progname=progname)
-        else:
-            Actions(action).do(f"File '{filepath}' already exists. " + extra_text,
-                               progname=progname, exception_class=exception_class)
-            return None
+    elif _file_exists_cached(str(pathobj)) if use_cache else os.access(pathobj, os.F_OK):
+        _to_action(action)(f"File '{filepath}' already exists. " + extra_text,
+                           progname=progname, exception_class=exception_class)
+        return None
     return pathobj
\ No newline at end of file
@@ -1,14 +1,17 @@
 """Methods for manipulations with packages."""
 
+import functools
 from importlib.resources import files
 
 
+@functools.lru_cache(maxsize=128)
 def getmainname(packagedunder: str) -> str:
     """Return name of the main package from __package__."""
     if packagedunder is not None:
-        return packagedunder.split('.')[0]
+        return packagedunder.partition('.')[0]
 
 
+@functools.lru_cache(maxsize=128)
 def getrootpath(packagedunder: str):
     """Return PosixPath to the package root dir"""
     return files(getmainname(packagedunder))
\ No newline at end of file
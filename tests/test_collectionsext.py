@@ -0,0 +1,91 @@
+"""Tests of ROdict."""
+
+import unittest
+from mypythonlib._private.collectionsext import ROdict
+
+
+class TestROdictUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.rodict = ROdict(a=1, __b=2, c=[1, 2])
+
+    def test_update_existing_and_under(self):
+        self.rodict.update({'a': 5, '_d': 3}, __e=4)
+        self.assertEqual(self.rodict.dict(), {'a': 5, 'b': 2, 'c': [1, 2], 'd': 3, 'e': 4})
+        self.assertEqual(set(self.rodict.rokeys()), {'b', 'e'})
+
+    def test_update_from_rodict_keeps_protection(self):
+        self.rodict.update(ROdict(__a=7))
+        self.assertEqual(self.rodict['a'], 7)
+        self.assertIn('a', set(self.rodict.rokeys()))
+
+    def test_update_copies_values(self):
+        value = [3]
+        self.rodict.update(c=value)
+        value.append(4)
+        self.assertEqual(self.rodict['c'], [3])
+
+    def test_failed_update_changes_nothing(self):
+        before, rokeys = self.rodict.dict(), set(self.rodict.rokeys())
+        for bad in ({'a': 5, '__f': 1, 'b': 9},  # Read-only key
+                    {'a': 5, 'new': 1},  # New normal key
+                    {'a': 5, 1: 2}):  # Not a string key
+            with self.subTest(bad=bad):
+                with self.assertRaises((KeyError, TypeError)):
+                    self.rodict.update(bad)
+                self.assertEqual(self.rodict.dict(), before)
+                self.assertEqual(set(self.rodict.rokeys()), rokeys)
+
+    def test_failed_update_restores_only_touched_keys(self):
+        stored = self.rodict._dict
+        value = stored['c']
+        with self.assertRaises(KeyError):
+            self.rodict.update({'a': 5, '_a': 6, '__d': 1, '_b': 7, '__b': 8, 'b': 9})
+        self.assertIs(self.rodict._dict, stored)  # Not replaced by a saved copy
+        self.assertIs(stored['c'], value)
+        self.assertEqual(self.rodict.dict(), {'a': 1, 'b': 2, 'c': [1, 2]})
+        self.assertEqual(set(self.rodict.rokeys()), {'b'})
+
+    def test_wrong_argument_type(self):
+        with self.assertRaises(TypeError):
+            self.rodict.update({'a': 5}, [('a', 1)])
+        self.assertEqual(self.rodict['a'], 1)
+
+
+class _DefaultsDict(ROdict):
+    """Return 0 for the missing keys."""
+
+    __slots__ = ()
+
+    def _item_get_missing_as_normal(self, key):
+        return 0
+
+
+class _DoubledDict(ROdict):
+    """Return the doubled stored values."""
+
+    __slots__ = ()
+
+    def _item_get_existing_as_normal(self, key):
+        return 2 * self._dict[key]
+
+
+class TestROdictGetHooks(unittest.TestCase):
+
+    def test_contains(self):
+        rodict = ROdict(a=1, __b=2)
+        self.assertTrue('a' in rodict and '_b' in rodict and '__a' in rodict)
+        self.assertNotIn('zzz', rodict)
+        self.assertIn('zzz', _DefaultsDict(a=1))  # As Mapping does it through self[key]
+
+    def test_eq(self):
+        self.assertEqual(ROdict(a=1, __b=[2]), {'a': 1, 'b': [2]})
+        self.assertEqual(ROdict(a=1, __b=[2]), ROdict(__a=1, b=[2]))
+        self.assertNotEqual(ROdict(a=1), ROdict(a=2))
+        self.assertEqual(_DoubledDict(a=1), {'a': 2})
+        self.assertNotEqual(_DoubledDict(a=1), ROdict(a=1))
+        self.assertNotEqual(ROdict(a=1), _DoubledDict(a=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
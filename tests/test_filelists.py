@@ -0,0 +1,136 @@
+"""Tests of the lists of paths."""
+
+import os
+import tempfile
+import unittest
+from mypythonlib import Actions
+from mypythonlib.pathlib import FilePath, FilePathAbs
+from mypythonlib.filelists import ListofPaths, check_files_in_list_exist, _paths_exist, \
+    _SCANDIR_MIN_FILES
+
+_ITEMS = ['a', '/b', '', '.', 'c/', 'd//e', './f', FilePath('g/h')]
+
+
+def _joined(prepath, path, postpath) -> str:
+    """Return str(FilePath) of the paths joined by '/' without creating the '//' root."""
+    joined = '/'.join([x for x in (prepath, str(FilePath(path)), postpath) if x])
+    if joined[:2] == '//':
+        joined = '/' + joined.lstrip('/')
+    return str(FilePath(joined))
+
+
+class TestListofPaths(unittest.TestCase):
+
+    def _strs(self, lst: ListofPaths) -> list[str]:
+        return [str(x) for x in lst]
+
+    def test_items(self):
+        self.assertEqual(self._strs(ListofPaths(_ITEMS)), [str(FilePath(x)) for x in _ITEMS])
+
+    def test_join(self):
+        for prepath in ('', '/', '/p', 'p/', 'p', '/p//'):
+            for postpath in ('', 'x', '/x', 'x/', '/'):
+                with self.subTest(prepath=prepath, postpath=postpath):
+                    lst = ListofPaths(_ITEMS)
+                    if prepath:
+                        lst = prepath / lst
+                    if postpath:
+                        lst = lst / postpath
+                    self.assertEqual(self._strs(lst),
+                                     [_joined(prepath, x, postpath) for x in _ITEMS])
+
+    def test_join_root(self):
+        self.assertEqual(self._strs(ListofPaths(['/']) / '/x'), ['/x'])
+        self.assertEqual(self._strs('/' / ListofPaths(['x', '/y'])), ['/x', '/y'])
+        self.assertEqual(self._strs(ListofPaths(['']) / '/x'), ['x'])
+        self.assertEqual(self._strs(ListofPaths(['a'], basepath='/')), ['/a'])
+
+    def test_names(self):
+        self.assertEqual(self._strs(ListofPaths(_ITEMS).names()),
+                         [str(FilePath(FilePath(x).name)) for x in _ITEMS])
+
+    def test_absolute(self):
+        self.assertEqual(self._strs(ListofPaths(_ITEMS).absolute('/base')),
+                         [str(FilePathAbs('/base', x)) for x in _ITEMS])
+        with self.assertRaises(ValueError):
+            ListofPaths(_ITEMS).absolute('base')
+
+
+class TestPathsExist(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dirname = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _make(self, nfiles: int) -> tuple[list[str], list[bool]]:
+        """Create files, a subdir and symlinks, return paths with missing ones and the flags."""
+        paths, flags = [], []
+        for i in range(nfiles):
+            path = os.path.join(self.dirname, f'f{i}.txt')
+            open(path, 'w').close()
+            paths += [path, path + '_missing']
+            flags += [True, False]
+        os.mkdir(os.path.join(self.dirname, 'subdir'))
+        os.symlink('f0.txt', os.path.join(self.dirname, 'link'))
+        os.symlink('absent', os.path.join(self.dirname, 'broken'))
+        for name, exists in (('subdir', True), ('link', True), ('broken', False)):
+            paths.append(os.path.join(self.dirname, name))
+            flags.append(exists)
+        return paths, flags
+
+    def test_scandir_listing(self):
+        paths, flags = self._make(_SCANDIR_MIN_FILES)
+        self.assertEqual(_paths_exist(paths), flags)
+
+    def test_access_fallback(self):
+        paths, flags = self._make(2)  # Too few files for a listing
+        self.assertEqual(_paths_exist(paths), flags)
+
+    def test_missing_dir(self):
+        paths = [os.path.join(self.dirname, 'absent', f'f{i}') for i in range(_SCANDIR_MIN_FILES)]
+        self.assertEqual(_paths_exist(paths), [False] * _SCANDIR_MIN_FILES)
+
+    def test_several_dirs(self):
+        paths, flags = self._make(_SCANDIR_MIN_FILES)
+        paths += ['/', self.dirname, os.path.join(self.dirname, 'subdir', 'f0.txt')]
+        flags += [True, True, False]
+        self.assertEqual(_paths_exist(paths), flags)
+
+
+class TestCheckFilesInListExist(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'f.txt')
+        open(self.path, 'w').close()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_trailing_slash_and_duplicated_separators(self):
+        dirname, name = os.path.split(self.path)
+        for path in (self.path + '/', dirname + '//' + name, dirname + '/./' + name + '/'):
+            with self.subTest(path=path):
+                found = check_files_in_list_exist([path], action=Actions.EXCEPTION)
+                self.assertEqual([str(x) for x in found], [self.path])
+
+    def test_relative_path_with_trailing_slash(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+        try:
+            found = check_files_in_list_exist(['f.txt/'], action=Actions.EXCEPTION)
+        finally:
+            os.chdir(cwd)
+        self.assertEqual([str(x) for x in found], [self.path])
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            check_files_in_list_exist([self.path, self.path + '_missing/'],
+                                      action=Actions.EXCEPTION)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests of the logger behind the print* functions."""
+
+import io
+import os
+import tempfile
+import contextlib
+import subprocess
+import unittest
+from mypythonlib.main import logger, printandlog, printred
+
+
+class TestDefaultProgname(unittest.TestCase):
+
+    def tearDown(self):
+        logger.default_progname = None
+
+    def _printed(self, *args, **kwargs) -> str:
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            printandlog(*args, **kwargs)
+        return out.getvalue()
+
+    def test_default_progname_is_used(self):
+        logger.default_progname = 'myscript'
+        self.assertEqual(self._printed('text'), '[myscript]: text\n')
+
+    def test_explicit_progname_wins(self):
+        logger.default_progname = 'myscript'
+        self.assertEqual(self._printed('text', 'other'), '[other]: text\n')
+        self.assertEqual(self._printed('text', ''), 'text\n')
+
+
+class TestColoredPrint(unittest.TestCase):
+
+    def test_single_colored_line(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            printred('text', 'prog')
+        self.assertEqual(out.getvalue(), '\033[91m[prog]: text\033[0m\n')
+
+    def test_without_stdout(self):
+        with contextlib.redirect_stdout(None):  # E.g. pythonw or a daemon
+            printred('text', 'prog')  # Must not raise
+
+
+class TestPopen(unittest.TestCase):
+
+    def _run(self, cmd: str) -> tuple[bool, int, str]:
+        """Return whether the command was run directly, its return code and output."""
+        child = logger._popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              universal_newlines=True)
+        output = child.communicate()[0]
+        return isinstance(child.args, list), child.returncode, output
+
+    def test_simple_command_is_run_directly(self):
+        self.assertEqual(self._run("echo 'a  b' c"), (True, 0, 'a  b c\n'))
+        self.assertEqual(self._run('false'), (True, 1, ''))
+
+    def test_shell_builtin(self):
+        self.assertEqual(self._run('exit 3'), (False, 3, ''))
+
+    def test_env_assignment(self):
+        direct, code, output = self._run('FOO_MYPYTHONLIB=1 env')
+        self.assertEqual((direct, code), (False, 0))
+        self.assertIn('FOO_MYPYTHONLIB=1\n', output)
+
+    def test_unbalanced_quotes(self):
+        direct, code, _ = self._run("echo 'abc")
+        self.assertFalse(direct)
+        self.assertNotEqual(code, 0)
+
+    def test_shell_metacharacters(self):
+        self.assertEqual(self._run('echo a | tr a b; exit 4'), (False, 4, 'b\n'))
+        self.assertEqual(self._run('echo $((1 + 2))'), (False, 0, '3\n'))
+
+    def test_missing_command(self):
+        direct, code, _ = self._run('surely-absent-command-mypythonlib')
+        self.assertEqual((direct, code), (False, 127))
+
+
+class TestCallTee(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.teepath = os.path.join(self.tmpdir.name, 'tee.log')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _call(self, cmd: str, stdin: str = ''):
+        with contextlib.redirect_stdout(io.StringIO()) as out:  # Text stream without .buffer
+            child = logger._call_popen_tee(cmd, stdin, self.teepath)
+        return child.returncode, out.getvalue()
+
+    def test_output_goes_to_terminal_and_file(self):
+        code, printed = self._call('echo line; exit 3')
+        self.assertEqual(code, 3)
+        self.assertEqual(printed, 'line\n')
+        with open(self.teepath) as ftee:
+            self.assertEqual(ftee.read(), 'line\n')
+
+    def test_stdin_is_passed(self):
+        code, printed = self._call('cat', stdin='input\n')
+        self.assertEqual((code, printed), (0, 'input\n'))
+
+    def test_split_multibyte_character(self):
+        code, printed = self._call("printf '\\303'; sleep 0.1; printf '\\251'")
+        self.assertEqual(printed, '\u00e9')
+
+    def test_unwritable_file_raises_before_running(self):
+        self.teepath = os.path.join(self.tmpdir.name, 'absent', 'tee.log')
+        marker = os.path.join(self.tmpdir.name, 'marker')
+        with self.assertRaises(OSError):
+            self._call(f'touch {marker}')
+        self.assertFalse(os.path.exists(marker))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""Tests of the checks in mypythonlib.main."""
+
+import os
+import tempfile
+import unittest
+from mypythonlib import Actions, check_file_exists, check_file_not_exist_or_remove
+
+
+class TestExistsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'file.txt')
+        check_file_exists.cache_clear()
+
+    def tearDown(self):
+        check_file_exists.cache_clear()
+        self.tmpdir.cleanup()
+
+    def test_cached_result_is_reused_until_cleared(self):
+        self.assertIsNone(check_file_exists(self.path, Actions.NOTHING, use_cache=True))
+        open(self.path, 'w').close()
+        self.assertIsNone(check_file_exists(self.path, Actions.NOTHING, use_cache=True))
+        self.assertEqual(str(check_file_exists(self.path, Actions.NOTHING)), self.path)
+        check_file_exists.cache_clear()
+        self.assertEqual(str(check_file_exists(self.path, Actions.NOTHING, use_cache=True)),
+                         self.path)
+
+    def test_removal_invalidates_the_entry(self):
+        open(self.path, 'w').close()
+        self.assertIsNotNone(check_file_exists(self.path, Actions.NOTHING, use_cache=True))
+        check_file_not_exist_or_remove(self.path, override=True, remove_warning=False)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(str(check_file_not_exist_or_remove(self.path, use_cache=True)),
+                         self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests of the FilePath classes."""
+
+import gc
+import os
+import tempfile
+import unittest
+from pathlib import PurePosixPath
+from mypythonlib import TempfilePath
+from mypythonlib.pathlib import FilePath
+
+
+class _UpperPath(FilePath):
+    """Subclass parsing the arguments in its own way like myfits.ExtPath."""
+
+    __slots__ = ()
+
+    @classmethod
+    def _parse_args(cls, args):
+        return super()._parse_args([str(x).upper() for x in args])
+
+
+class TestFilePath(unittest.TestCase):
+
+    def test_parsing_as_pureposixpath(self):
+        for path in ('', '.', 'a', 'a/', 'a//b/./c', '/', '//', '///', '//a', '/a/../b'):
+            with self.subTest(path=path):
+                expected = PurePosixPath(path)
+                self.assertEqual(str(FilePath(path)), str(expected))
+                self.assertEqual(FilePath(path).parts, expected.parts)
+                self.assertEqual(str(FilePath(expected)), str(expected))
+
+    def test_subclass_parse_args_is_used(self):
+        for arg in ('a/b', FilePath('a/b'), PurePosixPath('a/b')):
+            with self.subTest(arg=arg):
+                self.assertEqual(str(_UpperPath(arg)), 'A/B')
+        self.assertEqual(str(_UpperPath('a', 'b')), 'A/B')
+        self.assertEqual(str(_UpperPath('x/c').with_parent('d')), 'D/C')
+
+
+class TestTempfilePath(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _create(self, **kwargs) -> tuple[TempfilePath, str]:
+        path = TempfilePath(self.tmpdir.name, 'tmpfile.txt', **kwargs)
+        open(path, 'w').close()
+        return path, str(path)
+
+    def test_file_is_removed_with_object(self):
+        path, pathstr = self._create()
+        self.assertFalse(path.preserved)
+        del path
+        gc.collect()
+        self.assertFalse(os.path.exists(pathstr))
+        self.assertNotIn(pathstr, TempfilePath._files)
+
+    def test_preserve_argument(self):
+        path, pathstr = self._create(preserve=True)
+        self.assertTrue(path.preserved)
+        del path
+        gc.collect()
+        self.assertTrue(os.path.exists(pathstr))
+        self.assertNotIn(pathstr, TempfilePath._files)  # Unregistered anyway
+
+    def test_preserved_set_after_creation(self):
+        path, pathstr = self._create()
+        path.preserved = True
+        del path
+        gc.collect()
+        self.assertTrue(os.path.exists(pathstr))
+
+    def test_duplicate_does_not_affect_original(self):
+        path, pathstr = self._create()
+        with self.assertRaises(OSError):  # The file exists already
+            TempfilePath(pathstr)
+        gc.collect()
+        self.assertTrue(os.path.exists(pathstr))
+        self.assertIn(pathstr, TempfilePath._files)
+
+
+if __name__ == '__main__':
+    unittest.main()